@@ -0,0 +1,39 @@
+"""
+gesture_kernels.py
+JIT-compiled landmark math for the hand gesture controller (python.py).
+Falls back to plain Python when Numba is not installed.
+"""
+
+import math
+
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True, fastmath=True)
+def analyze_hand(landmarks):
+    """
+    Fused finger count, pinch distance and palm x for a (21, 3) landmark array
+    Returns (fingers_up, pinch_dist, palm_x)
+    """
+    # Thumb (compare x-coordinates)
+    fingers = 1 if landmarks[4, 0] < landmarks[3, 0] else 0
+    
+    # Other fingers (compare tip vs pip y-coordinates)
+    for tip, pip in ((8, 6), (12, 10), (16, 14), (20, 18)):
+        if landmarks[tip, 1] < landmarks[pip, 1]:
+            fingers += 1
+    
+    # Thumb tip to index tip
+    dx = landmarks[4, 0] - landmarks[8, 0]
+    dy = landmarks[4, 1] - landmarks[8, 1]
+    dz = landmarks[4, 2] - landmarks[8, 2]
+    pinch_dist = math.sqrt(dx * dx + dy * dy + dz * dz)
+    
+    return fingers, pinch_dist, landmarks[9, 0]
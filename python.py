@@ -3,8 +3,62 @@ import mediapipe as mp
 import numpy as np
 import serial
 import serial.tools.list_ports
+import sys
 import time
-from collections import deque
+import queue
+import threading
+from array import array
+from collections import Counter, deque
+
+from gesture_kernels import analyze_hand
+
+
+class RingBuffer:
+    """
+    Fixed-size rolling window with an O(1) running mean
+    Backed by one contiguous float64 slab, also exposed as a zero-copy NumPy view
+    """
+    def __init__(self, maxlen):
+        self.maxlen = maxlen
+        self.buf = array('d', [0.0] * maxlen)  # Fast scalar writes from Python
+        self.view = np.frombuffer(self.buf, dtype=np.float64)  # Same memory, for bulk math
+        self.idx = 0
+        self.count = 0
+        self.sum_ = 0.0
+    
+    def __len__(self):
+        return self.count
+    
+    def append(self, x):
+        # Slots that were never filled hold 0.0, so this also covers the warm-up
+        self.sum_ += x - self.buf[self.idx]
+        self.buf[self.idx] = x
+        self.idx = (self.idx + 1) % self.maxlen
+        if self.count < self.maxlen:
+            self.count += 1
+        elif self.idx == 0:
+            # Once per lap, resync the running sum so rounding error can't accumulate
+            self.sum_ = float(self.view.sum())
+    
+    def mean(self):
+        return self.sum_ / self.count if self.count else 0.0
+    
+    def clear(self):
+        self.view[:] = 0.0
+        self.idx = 0
+        self.count = 0
+        self.sum_ = 0.0
+
+
+# Wire layout of one serialized NormalizedLandmark carrying only x, y, z:
+# field 1 (length-delimited, 15 bytes) wrapping fixed32 fields 1, 2 and 3.
+# (byte offset within the 17-byte record, expected byte repeated for all 21 records)
+_LANDMARK_RECORD_SIZE = 17
+_LANDMARK_WIRE_CHECKS = [
+    (off, tag * 21)
+    for off, tag in ((0, b'\x0a'), (1, b'\x0f'), (2, b'\x0d'), (7, b'\x15'), (12, b'\x1d'))
+]
+
 
 class HandGestureRobot:
     def __init__(self, port=None, baud=115200):
@@ -13,31 +67,71 @@ class HandGestureRobot:
         self.hands = self.mp_hands.Hands(
             static_image_mode=False,
             max_num_hands=1,
-            min_detection_confidence=0.7,
-            min_tracking_confidence=0.7
+            model_complexity=0,  # Lite model, roughly half the latency
+            min_detection_confidence=0.6,
+            min_tracking_confidence=0.5
         )
-        self.mp_draw = mp.solutions.drawing_utils
+        self.inference_size = (320, 240)  # Downscaled copy fed to MediaPipe
+        self._small_buf = None  # Reused resize/RGB buffers (allocated lazily)
+        self._rgb_buf = None
+        # Duplicate-frame skipping: signature of the last processed frame and its results
+        self._last_sig = None
+        self._last_results = None
+        self._last_results_time = 0.0
+        self.max_results_age = 0.2  # Seconds before results must be recomputed
+        # (N, 2) landmark index pairs for drawing the skeleton in one polylines call
+        self._hand_connections = np.array(sorted(self.mp_hands.HAND_CONNECTIONS), dtype=np.intp)
         
         # Gesture state
         self.current_gesture = "NONE"
         self.gesture_buffer = deque(maxlen=8)  # Larger buffer for stability
+        self._gesture_counts = Counter()  # Kept in sync with gesture_buffer
         self.active_servo = 1  # Currently controlled servo
         
         # Position smoothing buffer
-        self.position_buffer = deque(maxlen=5)
-        self.angle_buffer = deque(maxlen=5)
+        self.position_buffer = RingBuffer(5)
+        self.angle_buffer = RingBuffer(5)
         self.last_sent_angles = {i: None for i in range(1, 7)}  # Track each servo separately
+        self._stable_count = {i: 0 for i in range(1, 7)}  # Consecutive frames past the send threshold
+        
+        # Position -> angle lookup table indexed by round(x * 255)
+        # Dead zones on edges (5% on each side), the rest mapped linearly to 0-180°
+        dead_zone = 0.05
+        xs = np.clip(np.linspace(0, 1, 256), dead_zone, 1 - dead_zone)
+        self._angle_lut = ((xs - dead_zone) / (1 - 2 * dead_zone) * 180).astype(int).tolist()
         
         # Serial connection
         self.ser = None
         self.connected = False
+        self._tx_q = queue.Queue(maxsize=16)  # (servo, angle) commands for the serial thread
+        self._tx_thread = None
+        self._tx_stop = threading.Event()  # Tells the serial thread to flush and exit
+        # Precomputed ASCII payloads: self._cmd_table[servo][angle] -> b"<servo><angle>\n"
+        self._cmd_table = [[f"{s}{a}\n".encode('ascii') for a in range(181)] for s in range(7)]
         if port:
             self.connect_arduino(port, baud)
         
         # FPS calculation
-        self.fps_buffer = deque(maxlen=30)
+        self.fps_buffer = RingBuffer(30)
         self.last_time = time.time()
         
+        # Pipeline state (reader -> compute -> display threads)
+        self.stop_event = threading.Event()
+        self.home_event = threading.Event()  # Homing is done on the compute thread
+        self.display_interval = 1 / 30  # Minimum seconds between imshow calls
+        
+        # Display layout
+        self.bar_height = 30
+        self.panel_height = 250
+        self._static_overlay = None  # Built lazily once the frame size is known
+        self._static_mask = None
+        # Output frame (camera + panel) buffers, rotated so the display thread
+        # never reads a buffer the compute thread is drawing into
+        self._combined_pool = []
+        self._combined_idx = 0
+        self._panel_dynamic_rows = 235  # Rows below this only hold static text
+        self._text_cache = {}  # (text, scale, color, thickness) -> pre-rendered patch
+        
         # Servo names (MATCHES YOUR ARDUINO MAPPING)
         self.servo_names = {
             1: "ELBOW",
@@ -57,6 +151,9 @@ class HandGestureRobot:
             "OPEN": 2,   # Open hand → SHOULDER (servo 2)
             "FIST": 6    # Fist → BASE (servo 6)
         }
+        
+        # Compile the Numba kernel now rather than stalling on the first detected hand
+        analyze_hand(np.zeros((21, 3), dtype=np.float32))
     
     def list_ports(self):
         """List available COM ports"""
@@ -71,11 +168,15 @@ class HandGestureRobot:
             self.connected = True
             print(f"✓ Connected to {port} @ {baud} baud")
             
+            # Serial writes happen on their own thread so the gesture loop never blocks
+            self._tx_stop.clear()
+            self._tx_thread = threading.Thread(target=self._tx_loop, daemon=True)
+            self._tx_thread.start()
+            
             # Home all servos to 90°
             for servo_num in range(1, 7):
                 self.send_to_arduino(servo_num, 90)
                 self.last_sent_angles[servo_num] = 90
-                time.sleep(0.05)
             
             return True
         except Exception as e:
@@ -85,64 +186,86 @@ class HandGestureRobot:
     
     def disconnect(self):
         """Disconnect from Arduino"""
+        # Stop accepting commands, then let the serial thread flush what's queued
+        self.connected = False
+        if self._tx_thread:
+            self._tx_stop.set()
+            self._tx_thread.join(timeout=1.0)
+            self._tx_thread = None
         if self.ser and self.ser.is_open:
             self.ser.close()
-        self.connected = False
         print("Disconnected from Arduino")
     
     def send_to_arduino(self, servo_index, angle):
         """
-        Send command in format: servoIndexangle
+        Queue command in format: servoIndexangle
         Example: "190" = servo 1 to 90°, "6120" = servo 6 to 120°
+        Non-blocking; if the serial queue is full the oldest command is dropped,
+        since the newest angle is the one that matters
         """
         if not self.connected or not self.ser:
             return False
         
-        try:
-            # Format: servo index (1-6) + angle (0-180)
-            command = f"{int(servo_index)}{int(angle)}\n"
-            self.ser.write(command.encode('ascii'))
-            return True
-        except Exception as e:
-            print(f"Serial error: {e}")
+        servo_index = int(servo_index)
+        if not 1 <= servo_index <= 6:
             return False
+        angle = max(0, min(180, int(angle)))
+        
+        while True:
+            try:
+                self._tx_q.put_nowait((servo_index, angle))
+                return True
+            except queue.Full:
+                try:
+                    self._tx_q.get_nowait()
+                except queue.Empty:
+                    pass
     
-    def count_fingers(self, hand_landmarks):
-        """Count extended fingers"""
-        fingers_up = 0
-        
-        # Thumb (compare x-coordinates)
-        if hand_landmarks.landmark[4].x < hand_landmarks.landmark[3].x:
-            fingers_up += 1
-        
-        # Other fingers (compare y-coordinates)
-        finger_tips = [8, 12, 16, 20]  # Index, Middle, Ring, Pinky
-        finger_pips = [6, 10, 14, 18]
-        
-        for tip, pip in zip(finger_tips, finger_pips):
-            if hand_landmarks.landmark[tip].y < hand_landmarks.landmark[pip].y:
-                fingers_up += 1
-        
-        return fingers_up
+    def _tx_loop(self):
+        """Write queued servo commands to the Arduino (runs on the serial thread)"""
+        # Keep going after a stop request until the queue is drained
+        while not (self._tx_stop.is_set() and self._tx_q.empty()):
+            try:
+                servo_index, angle = self._tx_q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            
+            # Coalesce bursts: only the latest angle per servo matters
+            latest = {servo_index: angle}
+            while True:
+                try:
+                    servo_index, angle = self._tx_q.get_nowait()
+                except queue.Empty:
+                    break
+                latest[servo_index] = angle
+            
+            for servo_index, angle in latest.items():
+                try:
+                    # Format: servo index (1-6) + angle (0-180)
+                    self.ser.write(self._cmd_table[servo_index][angle])
+                except Exception as e:
+                    print(f"Serial error: {e}")
     
-    def calculate_pinch_distance(self, hand_landmarks):
-        """Calculate distance between thumb tip and index finger tip"""
-        thumb_tip = hand_landmarks.landmark[4]
-        index_tip = hand_landmarks.landmark[8]
-        
-        distance = np.sqrt(
-            (thumb_tip.x - index_tip.x)**2 + 
-            (thumb_tip.y - index_tip.y)**2 + 
-            (thumb_tip.z - index_tip.z)**2
-        )
-        
-        return distance
+    def _lm_to_array(self, hand_landmarks):
+        """Convert the 21 MediaPipe landmarks into a (21, 3) float32 array of x, y, z"""
+        # Fast path: parse the serialized NormalizedLandmarkList in bulk. When only
+        # x, y, z are set every landmark is the same fixed 17-byte record, so the
+        # floats can be read with a single strided view over the bytes.
+        data = hand_landmarks.SerializeToString()
+        step = _LANDMARK_RECORD_SIZE
+        if len(data) == 21 * step and all(
+                data[off::step] == expected for off, expected in _LANDMARK_WIRE_CHECKS):
+            return np.ndarray((21, 3), dtype='<f4', buffer=data, offset=3,
+                              strides=(step, 5)).astype(np.float32)
+        
+        # Fallback (e.g. visibility/presence also set): one pass over the protobuf
+        return np.fromiter(
+            (v for lm in hand_landmarks.landmark for v in (lm.x, lm.y, lm.z)),
+            dtype=np.float32, count=63
+        ).reshape(21, 3)
     
-    def detect_gesture(self, hand_landmarks):
-        """Detect hand gesture (YOUR METHOD)"""
-        fingers = self.count_fingers(hand_landmarks)
-        pinch_dist = self.calculate_pinch_distance(hand_landmarks)
-        
+    def detect_gesture(self, fingers, pinch_dist):
+        """Detect hand gesture from analyze_hand's finger count and pinch distance (YOUR METHOD)"""
         # Gestures (exact order from your code)
         if fingers == 0:
             return "FIST"  # Fist = BASE
@@ -159,14 +282,15 @@ class HandGestureRobot:
         else:
             return "NONE"
     
-    def get_hand_center_position(self, hand_landmarks):
-        """
-        Get the center position of the hand (palm center)
-        Returns x position normalized 0-1 (left to right)
-        """
-        # Use palm center (landmark 9 is middle of palm)
-        palm_center = hand_landmarks.landmark[9]
-        return palm_center.x
+    def _push_gesture(self, gesture):
+        """Append to the gesture buffer, updating the per-gesture counts incrementally"""
+        if len(self.gesture_buffer) == self.gesture_buffer.maxlen:
+            evicted = self.gesture_buffer[0]
+            self._gesture_counts[evicted] -= 1
+            if not self._gesture_counts[evicted]:
+                del self._gesture_counts[evicted]
+        self.gesture_buffer.append(gesture)
+        self._gesture_counts[gesture] += 1
     
     def position_to_angle(self, x_position):
         """
@@ -174,20 +298,106 @@ class HandGestureRobot:
         Left side of screen = 0°
         Right side of screen = 180°
         """
-        # Add dead zones on edges (5% on each side)
-        dead_zone = 0.05
+        # Landmarks can land slightly outside the image, so clamp the index
+        idx = int(x_position * 255 + 0.5)  # Nearest LUT entry
+        if idx < 0:
+            idx = 0
+        elif idx > 255:
+            idx = 255
+        return self._angle_lut[idx]
+    
+    def _build_static_overlay(self, frame_width, frame_height):
+        """Pre-render everything on screen that never changes between frames"""
+        bar_height = self.bar_height
+        overlay = np.zeros((frame_height + self.panel_height, frame_width, 3), dtype=np.uint8)
+        
+        # Angle zone indicator (color bar at top)
+        cv2.rectangle(overlay, (0, 0), (frame_width, bar_height), (50, 50, 50), -1)
         
-        if x_position < dead_zone:
-            x_position = dead_zone
-        elif x_position > (1 - dead_zone):
-            x_position = 1 - dead_zone
+        # Angle markers
+        for angle in [0, 45, 90, 135, 180]:
+            x = int((angle / 180) * frame_width)
+            cv2.line(overlay, (x, 0), (x, bar_height), (255, 255, 255), 1)
+            cv2.putText(overlay, f"{angle}°", (x - 15, bar_height - 8),
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.4, (255, 255, 255), 1)
         
-        # Normalize to 0-1 range
-        normalized = (x_position - dead_zone) / (1 - 2 * dead_zone)
+        # Gesture mapping legend (right side)
+        legend_x = frame_width - 240
+        legend_y_start = frame_height + 30
+        cv2.putText(overlay, "Gesture Map:", (legend_x, legend_y_start), 
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 2)
+        cv2.putText(overlay, "PINCH -> Gripper", (legend_x, legend_y_start + 25), 
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.45, (255, 255, 255), 1)
+        cv2.putText(overlay, "3 Fingers -> Pronation", (legend_x, legend_y_start + 45), 
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.45, (255, 255, 255), 1)
+        cv2.putText(overlay, "Peace -> Flexion", (legend_x, legend_y_start + 65), 
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.45, (255, 255, 255), 1)
+        cv2.putText(overlay, "Point -> Elbow", (legend_x, legend_y_start + 85), 
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.45, (255, 255, 255), 1)
+        cv2.putText(overlay, "Open -> Shoulder", (legend_x, legend_y_start + 105), 
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.45, (255, 255, 255), 1)
+        cv2.putText(overlay, "Fist -> Base", (legend_x, legend_y_start + 125), 
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.45, (255, 255, 255), 1)
+        
+        # Instructions
+        cv2.putText(overlay, "Move hand LEFT/RIGHT to control angle | H=Home | Q=Quit", 
+                   (10, overlay.shape[0] - 10),
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
         
-        # Map to 0-180°
-        angle = int(normalized * 180)
-        return angle
+        # Any drawn (non-black) pixel gets copied onto the frame
+        self._static_overlay = overlay
+        self._static_mask = overlay.any(axis=2, keepdims=True)
+    
+    def _draw_hand(self, frame, landmarks):
+        """
+        Draw the hand skeleton from the (21, 3) landmark array
+        Same look as mediapipe's draw_landmarks, but all bones go in one cv2.polylines call
+        """
+        frame_height, frame_width = frame.shape[:2]
+        points = np.floor(landmarks[:, :2] * (frame_width, frame_height)).astype(np.int32)
+        np.minimum(points, (frame_width - 1, frame_height - 1), out=points)
+        connections = self._hand_connections
+        joints = points
+        
+        # Like draw_landmarks, skip landmarks outside the image and their bones
+        xy = landmarks[:, :2]
+        inside = ((xy >= 0) & (xy <= 1)).all(axis=1)
+        if not inside.all():
+            connections = connections[inside[connections].all(axis=1)]
+            joints = points[inside]
+        
+        # Bones (blue), then joints (light grey border, green fill) on top
+        if len(connections):
+            cv2.polylines(frame, points[connections], False, (255, 0, 0), 2)
+        for x, y in joints.tolist():
+            cv2.circle(frame, (x, y), 3, (224, 224, 224), 2)
+            cv2.circle(frame, (x, y), 2, (0, 255, 0), 2)
+    
+    def _blit_text(self, img, text, org, scale, color, thickness):
+        """
+        Drop-in for cv2.putText (FONT_HERSHEY_SIMPLEX) on the black status panel
+        Each distinct string is rasterized once and then copied in with a mask
+        """
+        key = (text, scale, color, thickness)
+        cached = self._text_cache.get(key)
+        if cached is None:
+            if len(self._text_cache) >= 2048:
+                self._text_cache.clear()
+            (w, h), baseline = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, scale, thickness)
+            pad = thickness + 2
+            patch = np.zeros((h + baseline + 2 * pad, w + 2 * pad, 3), dtype=np.uint8)
+            cv2.putText(patch, text, (pad, pad + h), cv2.FONT_HERSHEY_SIMPLEX, scale, color, thickness)
+            mask = patch.any(axis=2).astype(np.uint8)
+            cached = self._text_cache[key] = (patch, mask, pad, pad + h)
+        
+        patch, mask, off_x, off_y = cached
+        x0, y0 = org[0] - off_x, org[1] - off_y
+        patch_h, patch_w = mask.shape
+        if x0 < 0 or y0 < 0 or y0 + patch_h > img.shape[0] or x0 + patch_w > img.shape[1]:
+            # Clipped at the border: let OpenCV handle it
+            cv2.putText(img, text, org, cv2.FONT_HERSHEY_SIMPLEX, scale, color, thickness)
+            return
+        cv2.copyTo(patch, mask, img[y0:y0 + patch_h, x0:x0 + patch_w])
     
     def process_frame(self, frame):
         """Process video frame and control robot with position-based control"""
@@ -197,55 +407,84 @@ class HandGestureRobot:
         fps = 1 / (current_time - self.last_time + 1e-6)
         self.fps_buffer.append(fps)
         self.last_time = current_time
-        avg_fps = np.mean(self.fps_buffer)
-        
-        # Convert to RGB for MediaPipe
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = self.hands.process(rgb_frame)
+        avg_fps = self.fps_buffer.mean()
+        
+        # Webcams repeat identical frames on static scenes; reuse the last
+        # detection for those instead of re-running MediaPipe (kept fresh by max age)
+        sig = frame[::16, ::16, 1].tobytes()
+        if (sig == self._last_sig and self._last_results is not None and
+                current_time - self._last_results_time < self.max_results_age):
+            results = self._last_results
+        else:
+            # Downscale and convert to RGB for MediaPipe (landmarks are normalized,
+            # so they still map straight onto the full-size frame for drawing)
+            infer_w, infer_h = self.inference_size
+            if self._rgb_buf is None or self._rgb_buf.shape != (infer_h, infer_w, 3):
+                self._small_buf = np.empty((infer_h, infer_w, 3), dtype=np.uint8)
+                self._rgb_buf = np.empty_like(self._small_buf)
+            cv2.resize(frame, self.inference_size, dst=self._small_buf, interpolation=cv2.INTER_AREA)
+            self._rgb_buf.flags.writeable = True
+            cv2.cvtColor(self._small_buf, cv2.COLOR_BGR2RGB, dst=self._rgb_buf)
+            self._rgb_buf.flags.writeable = False  # Lets MediaPipe skip a copy
+            results = self.hands.process(self._rgb_buf)
+            self._last_sig = sig
+            self._last_results = results
+            self._last_results_time = current_time
         
         frame_height, frame_width = frame.shape[:2]
         
-        # Draw angle zone indicator (color bar at top)
-        bar_height = 30
-        cv2.rectangle(frame, (0, 0), (frame_width, bar_height), (50, 50, 50), -1)
-        
-        # Draw angle markers
-        for angle in [0, 45, 90, 135, 180]:
-            x = int((angle / 180) * frame_width)
-            cv2.line(frame, (x, 0), (x, bar_height), (255, 255, 255), 1)
-            cv2.putText(frame, f"{angle}°", (x - 15, bar_height - 8),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.4, (255, 255, 255), 1)
-        
-        # Draw status panel
-        panel_height = 250
-        panel = np.zeros((panel_height, frame_width, 3), dtype=np.uint8)
+        # Static overlay (angle bar, legend, instructions) is rendered once and reused
+        if (self._static_overlay is None or
+                self._static_overlay.shape[:2] != (frame_height + self.panel_height, frame_width)):
+            self._build_static_overlay(frame_width, frame_height)
+        
+        # Draw straight into a preallocated output buffer instead of stacking a new panel
+        combined_shape = (frame_height + self.panel_height, frame_width, 3)
+        if not self._combined_pool or self._combined_pool[0].shape != combined_shape:
+            self._combined_pool = [np.zeros(combined_shape, dtype=np.uint8) for _ in range(4)]
+        combined = self._combined_pool[self._combined_idx]
+        self._combined_idx = (self._combined_idx + 1) % len(self._combined_pool)
+        combined[:frame_height] = frame
+        frame = combined[:frame_height]
+        panel = combined[frame_height:]
+        
+        # Only the angle bar rows of the camera frame carry static content
+        bar_height = self.bar_height
+        bar_rows = bar_height + 1
+        np.copyto(frame[:bar_rows], self._static_overlay[:bar_rows],
+                  where=self._static_mask[:bar_rows])
+        
+        # Draw status panel (clear last use's dynamic text only)
+        panel[:self._panel_dynamic_rows] = 0
         
         # Connection status
         status_color = (0, 255, 0) if self.connected else (0, 0, 255)
         status_text = "CONNECTED" if self.connected else "DISCONNECTED"
-        cv2.putText(panel, f"Status: {status_text}", (10, 30), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.7, status_color, 2)
+        self._blit_text(panel, f"Status: {status_text}", (10, 30),
+                   0.7, status_color, 2)
         
         # FPS
-        cv2.putText(panel, f"FPS: {int(avg_fps)}", (10, 60),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+        self._blit_text(panel, f"FPS: {int(avg_fps)}", (10, 60),
+                   0.6, (255, 255, 255), 2)
         
         if results.multi_hand_landmarks:
             for hand_landmarks in results.multi_hand_landmarks:
+                # Single protobuf -> NumPy conversion per hand
+                landmarks = self._lm_to_array(hand_landmarks)
+                
                 # Draw hand skeleton
-                self.mp_draw.draw_landmarks(
-                    frame, hand_landmarks, self.mp_hands.HAND_CONNECTIONS,
-                    self.mp_draw.DrawingSpec(color=(0, 255, 0), thickness=2, circle_radius=2),
-                    self.mp_draw.DrawingSpec(color=(255, 0, 0), thickness=2)
-                )
+                self._draw_hand(frame, landmarks)
+                
+                # Finger count, pinch distance and palm center x (landmark 9) in one kernel call
+                fingers, pinch_dist, palm_x = analyze_hand(landmarks)
                 
                 # Detect gesture
-                gesture = self.detect_gesture(hand_landmarks)
-                self.gesture_buffer.append(gesture)
+                gesture = self.detect_gesture(fingers, pinch_dist)
+                self._push_gesture(gesture)
                 
                 # Smooth gesture detection (require consistency)
                 if len(self.gesture_buffer) >= 5:
-                    most_common = max(set(self.gesture_buffer), key=self.gesture_buffer.count)
+                    most_common = max(self._gesture_counts, key=self._gesture_counts.get)
                     if most_common != "NONE":
                         self.current_gesture = most_common
                         
@@ -258,16 +497,16 @@ class HandGestureRobot:
                                 self.angle_buffer.clear()
                 
                 # Get hand position
-                x_position = self.get_hand_center_position(hand_landmarks)
+                x_position = float(palm_x)
                 self.position_buffer.append(x_position)
                 
                 # Smooth position
-                smoothed_x = np.mean(self.position_buffer)
+                smoothed_x = self.position_buffer.mean()
                 
                 # Convert position to angle
                 angle = self.position_to_angle(smoothed_x)
                 self.angle_buffer.append(angle)
-                smoothed_angle = int(np.mean(self.angle_buffer))
+                smoothed_angle = int(self.angle_buffer.mean())
                 
                 # Draw position indicator on angle bar
                 indicator_x = int(smoothed_x * frame_width)
@@ -275,67 +514,51 @@ class HandGestureRobot:
                 cv2.circle(frame, (indicator_x, bar_height // 2), 12, (0, 0, 0), 2)
                 
                 # Draw vertical line from hand to indicator
-                palm_y = int(hand_landmarks.landmark[9].y * frame_height)
-                palm_x = int(hand_landmarks.landmark[9].x * frame_width)
+                palm_y = int(landmarks[9, 1] * frame_height)
+                palm_x = int(landmarks[9, 0] * frame_width)
                 cv2.line(frame, (palm_x, palm_y), (indicator_x, bar_height), (0, 255, 255), 2)
                 
                 # Display current gesture
                 gesture_color = (0, 255, 255) if self.current_gesture != "NONE" else (128, 128, 128)
-                cv2.putText(panel, f"Gesture: {self.current_gesture}", (10, 90),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.7, gesture_color, 2)
+                self._blit_text(panel, f"Gesture: {self.current_gesture}", (10, 90),
+                           0.7, gesture_color, 2)
                 
                 # Active servo (with arrow indicator)
                 servo_name = self.servo_names.get(self.active_servo, "UNKNOWN")
-                cv2.putText(panel, f">>> Servo {self.active_servo}: {servo_name}", (10, 125),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
+                self._blit_text(panel, f">>> Servo {self.active_servo}: {servo_name}", (10, 125),
+                           0.7, (0, 255, 255), 2)
                 
                 # Display angle
-                cv2.putText(panel, f"Target Angle: {smoothed_angle}°", (10, 160),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 165, 0), 2)
+                self._blit_text(panel, f"Target Angle: {smoothed_angle}°", (10, 160),
+                           0.6, (255, 165, 0), 2)
                 
                 # Display position
-                cv2.putText(panel, f"Hand Position: {smoothed_x:.2f}", (10, 190),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
+                self._blit_text(panel, f"Hand Position: {smoothed_x:.2f}", (10, 190),
+                           0.5, (200, 200, 200), 1)
                 
-                # Send to Arduino (only if changed by more than 3°)
+                # Send to Arduino (only if changed by more than 3° for 3 frames in a row,
+                # so jitter around the threshold doesn't turn into serial traffic)
                 if self.connected and self.current_gesture != "NONE":
                     last_angle = self.last_sent_angles[self.active_servo]
-                    if last_angle is None or abs(smoothed_angle - last_angle) > 3:
-                        self.send_to_arduino(self.active_servo, smoothed_angle)
-                        self.last_sent_angles[self.active_servo] = smoothed_angle
-                        cv2.putText(panel, f"✓ Sent: S{self.active_servo} = {smoothed_angle}°", 
-                                   (10, 220), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 2)
+                    if last_angle is not None and abs(smoothed_angle - last_angle) > 3:
+                        self._stable_count[self.active_servo] += 1
+                    else:
+                        self._stable_count[self.active_servo] = 0
+                    if last_angle is None or self._stable_count[self.active_servo] >= 3:
+                        self._stable_count[self.active_servo] = 0
+                        if self.send_to_arduino(self.active_servo, smoothed_angle):
+                            self.last_sent_angles[self.active_servo] = smoothed_angle
+                            self._blit_text(panel, f"✓ Sent: S{self.active_servo} = {smoothed_angle}°",
+                                       (10, 220), 0.5, (0, 255, 0), 2)
         
         else:
-            cv2.putText(panel, "No hand detected", (10, 90),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
+            self._blit_text(panel, "No hand detected", (10, 90),
+                       0.7, (0, 0, 255), 2)
             self.current_gesture = "NONE"
         
-        # Combine frame and panel
-        combined = np.vstack([frame, panel])
-        
-        # Gesture mapping legend (right side)
-        legend_x = frame_width - 240
-        legend_y_start = frame_height + 30
-        cv2.putText(combined, "Gesture Map:", (legend_x, legend_y_start), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 2)
-        cv2.putText(combined, "PINCH -> Gripper", (legend_x, legend_y_start + 25), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.45, (255, 255, 255), 1)
-        cv2.putText(combined, "3 Fingers -> Pronation", (legend_x, legend_y_start + 45), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.45, (255, 255, 255), 1)
-        cv2.putText(combined, "Peace -> Flexion", (legend_x, legend_y_start + 65), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.45, (255, 255, 255), 1)
-        cv2.putText(combined, "Point -> Elbow", (legend_x, legend_y_start + 85), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.45, (255, 255, 255), 1)
-        cv2.putText(combined, "Open -> Shoulder", (legend_x, legend_y_start + 105), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.45, (255, 255, 255), 1)
-        cv2.putText(combined, "Fist -> Base", (legend_x, legend_y_start + 125), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.45, (255, 255, 255), 1)
-        
-        # Instructions
-        cv2.putText(combined, "Move hand LEFT/RIGHT to control angle | H=Home | Q=Quit", 
-                   (10, combined.shape[0] - 10),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+        # Gesture mapping legend and instructions
+        np.copyto(combined[frame_height:], self._static_overlay[frame_height:],
+                  where=self._static_mask[frame_height:])
         
         return combined
     
@@ -345,16 +568,27 @@ class HandGestureRobot:
         for servo_num in range(1, 7):
             self.send_to_arduino(servo_num, 90)
             self.last_sent_angles[servo_num] = 90
-            time.sleep(0.05)
+            self._stable_count[servo_num] = 0
         
         self.position_buffer.clear()
         self.angle_buffer.clear()
     
     def run(self):
         """Main loop"""
-        cap = cv2.VideoCapture(0)
+        # Pick a low-latency backend explicitly (MSMF on Windows buffers several frames)
+        if sys.platform.startswith("win"):
+            backend = cv2.CAP_DSHOW
+        elif sys.platform.startswith("linux"):
+            backend = cv2.CAP_V4L2
+        else:
+            backend = cv2.CAP_ANY
+        cap = cv2.VideoCapture(0, backend)
+        if not cap.isOpened():
+            cap = cv2.VideoCapture(0)
+        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))  # Cheaper to decode than YUY2
         cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
         cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # Don't let the driver queue stale frames
         
         if not cap.isOpened():
             print("Error: Cannot access webcam")
@@ -381,19 +615,43 @@ class HandGestureRobot:
         print("  Q = Quit")
         print("="*70 + "\n")
         
+        poll_key = getattr(cv2, "pollKey", lambda: cv2.waitKey(1))
+        
+        # Bounded queues between the pipeline stages: read_q holds only the newest
+        # camera frame, show_q gives back-pressure from the display
+        read_q = queue.Queue(maxsize=1)
+        show_q = queue.Queue(maxsize=2)
+        self.stop_event.clear()
+        self.home_event.clear()
+        
+        reader = threading.Thread(target=self._reader_loop, args=(cap, read_q), daemon=True)
+        # MediaPipe Hands is stateful, so compute stays on a single thread
+        compute = threading.Thread(target=self._compute_loop, args=(read_q, show_q), daemon=True)
+        reader.start()
+        compute.start()
+        
         try:
-            while True:
-                ret, frame = cap.read()
-                if not ret:
-                    print("Failed to grab frame")
-                    break
+            # Display is human-rate bound: keep only the newest frame and show it on
+            # a fixed ~30 FPS schedule, so compute rates above 30 FPS never halve it
+            latest_frame = None
+            next_show = time.time()
+            while not self.stop_event.is_set():
+                timeout = 0.03
+                if latest_frame is not None:
+                    timeout = min(timeout, max(0.0, next_show - time.time()))
+                try:
+                    latest_frame = show_q.get(timeout=timeout)
+                except queue.Empty:
+                    pass
                 
-                frame = cv2.flip(frame, 1)
-                processed_frame = self.process_frame(frame)
+                now = time.time()
+                if latest_frame is not None and now >= next_show:
+                    cv2.imshow('Hand Gesture Robot Control', latest_frame)
+                    latest_frame = None
+                    next_show = max(next_show + self.display_interval, now)
                 
-                cv2.imshow('Hand Gesture Robot Control', processed_frame)
-                
-                key = cv2.waitKey(1) & 0xFF
+                # pollKey (OpenCV 4.5+) pumps GUI events without the 1 ms waitKey sleep
+                key = poll_key() & 0xFF
                 
                 # Quit
                 if key == ord('q') or key == ord('Q'):
@@ -401,13 +659,65 @@ class HandGestureRobot:
                 
                 # Home
                 elif key == ord('h') or key == ord('H'):
-                    self.home_all_servos()
+                    self.home_event.set()
         
         finally:
+            self.stop_event.set()
+            reader.join(timeout=1.0)
+            compute.join(timeout=1.0)
             cap.release()
             cv2.destroyAllWindows()
             self.disconnect()
             print("\nShutdown complete")
+    
+    def _reader_loop(self, cap, read_q):
+        """Grab and mirror webcam frames (runs on the reader thread)"""
+        while not self.stop_event.is_set():
+            if not cap.grab():
+                print("Failed to grab frame")
+                self.stop_event.set()
+                break
+            
+            ret, frame = cap.retrieve()
+            if not ret:
+                print("Failed to grab frame")
+                self.stop_event.set()
+                break
+            
+            frame = cv2.flip(frame, 1)
+            
+            # read_q is a latest-frame slot: replace a frame compute hasn't taken yet,
+            # so it always gets the newest one
+            try:
+                read_q.get_nowait()
+            except queue.Empty:
+                pass
+            try:
+                read_q.put_nowait(frame)
+            except queue.Full:
+                pass
+    
+    def _compute_loop(self, read_q, show_q):
+        """Run gesture detection on captured frames (runs on the compute thread)"""
+        while not self.stop_event.is_set():
+            try:
+                frame = read_q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            
+            if self.home_event.is_set():
+                self.home_event.clear()
+                self.home_all_servos()
+            
+            processed_frame = self.process_frame(frame)
+            
+            # Block while the display is behind (back-pressure), but stay responsive to stop
+            while not self.stop_event.is_set():
+                try:
+                    show_q.put(processed_frame, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
 
 
 def main():
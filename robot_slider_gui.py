@@ -10,10 +10,12 @@ import serial.tools.list_ports
 import time
 import json
 import os
+import threading
 
 # ---------- CONFIG ----------
 BAUD_DEFAULT = 9600
 SERVO_COUNT = 6
+FLUSH_INTERVAL = 0.1  # seconds between batched slider sends
 IMAGE_PATH = r"C:\Users\danyb\Desktop\Robo_GUI.png"  # reference image (from your upload)
 # ----------------------------
 
@@ -22,6 +24,9 @@ class SerialController:
     def __init__(self):
         self.ser = None
         self.connected = False
+        self.lock = threading.Lock()  # serialises writes from the GUI and sequence threads
+        # precomputed payloads: _cmd_table[servo][angle] -> b"<servo><angle>\n"
+        self._cmd_table = [[f"{s}{a}\n".encode('ascii') for a in range(181)] for s in range(SERVO_COUNT + 1)]
 
     def list_ports(self):
         ports = serial.tools.list_ports.comports()
@@ -39,8 +44,9 @@ class SerialController:
 
     def disconnect(self):
         try:
-            if self.ser and self.ser.is_open:
-                self.ser.close()
+            with self.lock:
+                if self.ser and self.ser.is_open:
+                    self.ser.close()
         except:
             pass
         self.connected = False
@@ -50,11 +56,23 @@ class SerialController:
         if not self.connected or not self.ser:
             return False, "Not connected"
         try:
-            cmd = f"{int(servo_index)}{int(angle)}\n"
-            self.ser.write(cmd.encode('ascii'))
-            # small delay
-            time.sleep(0.02)
-            return True, cmd
+            cmd = self._cmd_table[int(servo_index)][max(0, min(180, int(angle)))]
+            with self.lock:
+                self.ser.write(cmd)
+            return True, cmd.decode('ascii')
+        except Exception as e:
+            return False, str(e)
+
+    def send_pose(self, angles):
+        """Send all servo angles (servo 1..N in order) as one batched write."""
+        if not self.connected or not self.ser:
+            return False, "Not connected"
+        try:
+            payload = b"".join(self._cmd_table[i+1][max(0, min(180, int(a)))]
+                               for i, a in enumerate(angles))
+            with self.lock:
+                self.ser.write(payload)
+            return True, payload.decode('ascii')
         except Exception as e:
             return False, str(e)
 
@@ -102,7 +120,7 @@ right_col = [
     [sg.Button("Send All", key="-SEND_ALL-"), sg.Button("Home", key="-HOME-")],
     [sg.HorizontalSeparator()],
     [sg.Text("Sequence (poses):")],
-    [sg.Button("Save Pose", key="-SAVE-"), sg.Button("Run Sequence", key="-RUN-"), sg.Button("Clear", key="-CLEAR-")],
+    [sg.Button("Save Pose", key="-SAVE-"), sg.Button("Run Sequence", key="-RUN-"), sg.Button("Cancel", key="-CANCEL-"), sg.Button("Clear", key="-CLEAR-")],
     [sg.Text("Delay (s) between poses:"), sg.InputText("0.5", key="-DELAY-", size=(6,1))],
     [sg.Listbox(values=[], size=(50,6), key="-SEQ_LIST-")],
     [sg.Button("Export JSON", key="-EXPORT-"), sg.Button("Import JSON", key="-IMPORT-")],
@@ -119,12 +137,27 @@ window = sg.Window("Robot Slider Controller", layout, finalize=True)
 
 # internal state
 sequence = []
+pending = {}  # servo index -> latest angle from slider/input, flushed every FLUSH_INTERVAL
+last_flush = time.monotonic()
+seq_thread = None
+cancel_evt = threading.Event()
 
 def log(msg):
     existing = window["-LOG-"].get()
     new = existing + msg + "\n"
     window["-LOG-"].update(new)
 
+def run_sequence(poses, delay_s):
+    """Play poses on a worker thread; progress is posted back as window events."""
+    for idx, pose in enumerate(poses):
+        if cancel_evt.is_set():
+            break
+        window.write_event_value("-SEQ_PROGRESS-", (idx, pose))
+        if serial_ctrl.connected:
+            serial_ctrl.send_pose(pose)
+        cancel_evt.wait(delay_s)
+    window.write_event_value("-SEQ_DONE-", cancel_evt.is_set())
+
 # main event loop
 while True:
     event, values = window.read(timeout=100)
@@ -152,21 +185,16 @@ while True:
         window["-STATUS-"].update("Disconnected")
         log("Disconnected")
 
-    # slider moved -> update input box and send
+    # slider moved -> update input box and queue send
     for i in range(SERVO_COUNT):
         s_key = f"-S{i+1}-"
         in_key = f"-IN{i+1}-"
         if event == s_key:
             val = int(values[s_key])
             window[in_key].update(val)
-            if serial_ctrl.connected:
-                ok, resp = serial_ctrl.send_servo(i+1, val)
-                if ok:
-                    log(f"Sent: {resp.strip()}")
-                else:
-                    log(f"Err: {resp}")
+            pending[i+1] = val
 
-    # manual input changed -> update slider and send
+    # manual input changed -> update slider and queue send
     for i in range(SERVO_COUNT):
         in_key = f"-IN{i+1}-"
         s_key = f"-S{i+1}-"
@@ -175,33 +203,29 @@ while True:
                 ang = int(values[in_key])
                 ang = max(0, min(180, ang))
                 window[s_key].update(ang)
-                if serial_ctrl.connected:
-                    ok, resp = serial_ctrl.send_servo(i+1, ang)
-                    if ok:
-                        log(f"Sent: {resp.strip()}")
-                    else:
-                        log(f"Err: {resp}")
+                pending[i+1] = ang
             except:
                 pass
 
     if event == "-SEND_ALL-":
+        pending.clear()  # the full pose below supersedes any unsent slider change
         if serial_ctrl.connected:
-            for i in range(SERVO_COUNT):
-                ang = int(values[f"-S{i+1}-"])
-                ok, resp = serial_ctrl.send_servo(i+1, ang)
-                if ok:
-                    log(f"Sent: {resp.strip()}")
-                else:
-                    log(f"Err: {resp}")
+            pose = [int(values[f"-S{i+1}-"]) for i in range(SERVO_COUNT)]
+            ok, resp = serial_ctrl.send_pose(pose)
+            if ok:
+                log(f"Sent: {' '.join(resp.split())}")
+            else:
+                log(f"Err: {resp}")
         else:
             sg.popup("Not connected to serial port.")
 
     if event == "-HOME-":
+        pending.clear()  # don't let an unsent slider change undo the home pose
         for i in range(SERVO_COUNT):
             window[f"-S{i+1}-"].update(90)
             window[f"-IN{i+1}-"].update("90")
-            if serial_ctrl.connected:
-                serial_ctrl.send_servo(i+1, 90)
+        if serial_ctrl.connected:
+            serial_ctrl.send_pose([90] * SERVO_COUNT)
         log("Homed all servos to 90°")
 
     if event == "-SAVE-":
@@ -218,19 +242,30 @@ while True:
     if event == "-RUN-":
         if not sequence:
             sg.popup("Sequence empty. Save poses first.")
+        elif seq_thread and seq_thread.is_alive():
+            sg.popup("Sequence already running.")
         else:
             try:
                 delay_s = float(values["-DELAY-"])
             except:
                 delay_s = 0.5
             log(f"Running sequence ({len(sequence)} poses) with {delay_s}s delay")
-            for pose in sequence:
-                for i, ang in enumerate(pose):
-                    if serial_ctrl.connected:
-                        serial_ctrl.send_servo(i+1, ang)
-                    time.sleep(0.02)  # small gap between servo commands
-                time.sleep(delay_s)
-            log("Sequence finished")
+            pending.clear()
+            cancel_evt.clear()
+            seq_thread = threading.Thread(target=run_sequence, args=(list(sequence), delay_s), daemon=True)
+            seq_thread.start()
+
+    if event == "-CANCEL-":
+        if seq_thread and seq_thread.is_alive():
+            cancel_evt.set()
+
+    if event == "-SEQ_PROGRESS-":
+        idx, pose = values[event]
+        window["-SEQ_LIST-"].update(set_to_index=idx, scroll_to_index=idx)
+        log(f"Pose {idx+1}: {pose}")
+
+    if event == "-SEQ_DONE-":
+        log("Sequence cancelled" if values[event] else "Sequence finished")
 
     if event == "-EXPORT-":
         if not sequence:
@@ -256,6 +291,28 @@ while True:
             except Exception as e:
                 sg.popup("Failed to import:", e)
 
+    # flush slider/input changes: at most one send per servo every FLUSH_INTERVAL,
+    # however many events arrived since the last flush; held while a sequence
+    # is playing so slider moves don't fight it
+    now = time.monotonic()
+    seq_running = seq_thread is not None and seq_thread.is_alive()
+    if pending and not seq_running and now - last_flush >= FLUSH_INTERVAL:
+        if serial_ctrl.connected:
+            sent, errors = [], []
+            for servo, ang in pending.items():
+                ok, resp = serial_ctrl.send_servo(servo, ang)
+                if ok:
+                    sent.append(resp.strip())
+                else:
+                    errors.append(resp)
+            if sent:
+                log(f"Sent: {' '.join(sent)}")
+            if errors:
+                log(f"Err: {'; '.join(errors)}")
+        pending.clear()
+        last_flush = now
+
 # cleanup
+cancel_evt.set()
 serial_ctrl.disconnect()
 window.close()